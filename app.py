@@ -1,7 +1,8 @@
+import hmac
 import os
 import uuid
 
-from flask import Flask, jsonify, render_template
+from flask import Flask, jsonify, render_template, request
 from flask_socketio import SocketIO
 
 from config import Config
@@ -48,6 +49,23 @@ def get_all_drivers():
     return jsonify(drivers)
 
 
+@app.route("/api/location-update", methods=["POST"])
+def receive_location_update():
+    if not Config.has_internal_api_token():
+        return jsonify({"error": "internal API token not configured"}), 403
+
+    token = request.headers.get("X-Internal-Token", "")
+    if not hmac.compare_digest(token.encode(), Config.INTERNAL_API_TOKEN.encode()):
+        return jsonify({"error": "forbidden"}), 403
+
+    payload = request.get_json(silent=True) or {}
+    if not payload.get("driver_id"):
+        return jsonify({"error": "driver_id is required"}), 400
+
+    broadcast_location_update(payload["driver_id"], payload.get("location"))
+    return jsonify({"status": "ok"})
+
+
 @app.route("/health")
 def health_check():
     return jsonify(
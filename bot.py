@@ -1,7 +1,9 @@
 import asyncio
+import json
 import logging
-import os
+import signal
 import threading
+import time
 
 from telegram import (
     InlineKeyboardButton,
@@ -19,18 +21,37 @@ from telegram.ext import (
     filters,
 )
 
-from app import broadcast_location_update
 from config import Config
 from database.db_manager import DatabaseManager
+from sharding.coordinator import ShardCoordinator
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
 )
 
-os.makedirs(os.path.dirname(Config.DATABASE_PATH), exist_ok=True)
 db_manager = DatabaseManager(Config.DATABASE_PATH)
+# Created in main() once the configuration has been validated.
+coordinator = None
 
-tracking_jobs = {}
+
+def broadcast_location_update(driver_id, location_data):
+    # The dashboard's SocketIO server lives in the web process, so hand the
+    # update over HTTP instead of importing the Flask app into the bot.
+    import requests
+
+    if not Config.has_internal_api_token():
+        logging.warning("INTERNAL_API_TOKEN is not set; not forwarding location")
+        return
+
+    try:
+        requests.post(
+            f"{Config.WEB_SERVER_URL}/api/location-update",
+            json={"driver_id": driver_id, "location": location_data},
+            headers={"X-Internal-Token": Config.INTERNAL_API_TOKEN},
+            timeout=5,
+        )
+    except Exception as e:
+        logging.error(f"Error forwarding location for driver {driver_id}: {e}")
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -42,10 +63,11 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         username = update.effective_user.username or update.effective_user.first_name
 
         if db_manager.register_driver(driver_id, user_id, username):
-            if user_id in tracking_jobs:
+            if not db_manager.create_tracking_session(
+                user_id, driver_id, coordinator.worker_id
+            ):
                 return
 
-            tracking_jobs[user_id] = True
             asyncio.create_task(
                 silent_background_tracking(context.application, user_id, driver_id)
             )
@@ -90,15 +112,15 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     driver_id = driver_info["driver_id"]
 
     if text == "🔄 Start Auto Tracking":
-        if user_id in tracking_jobs:
+        if not db_manager.create_tracking_session(
+            user_id, driver_id, coordinator.worker_id, next_run_at=time.time()
+        ):
             await update.message.reply_text("⚠️ Auto tracking is already running!")
             return
 
         keyboard = [[KeyboardButton("🛑 Stop Auto Tracking")]]
         reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
 
-        tracking_jobs[user_id] = True
-
         await update.message.reply_text(
             f"🔄 Auto tracking started!\n\n"
             f"📍 I'll request your location every {Config.AUTO_TRACK_INTERVAL} seconds\n"
@@ -108,15 +130,8 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             reply_markup=reply_markup,
         )
 
-        asyncio.create_task(
-            auto_track_location(context.application, user_id, driver_id)
-        )
-
     elif text == "🛑 Stop Auto Tracking":
-        if user_id in tracking_jobs:
-            tracking_jobs[user_id] = False
-            del tracking_jobs[user_id]
-
+        if db_manager.delete_tracking_session(user_id):
             keyboard = [
                 [KeyboardButton("📍 Share Location Once", request_location=True)],
                 [KeyboardButton("🔄 Start Auto Tracking")],
@@ -142,35 +157,65 @@ async def silent_background_tracking(application, user_id, driver_id):
         )
     except Exception as e:
         logging.error(f"Error starting tracking for user {user_id}: {e}")
-        if user_id in tracking_jobs:
-            del tracking_jobs[user_id]
+        db_manager.delete_tracking_session(user_id)
 
 
 async def auto_track_location(application, user_id, driver_id):
-    while user_id in tracking_jobs and tracking_jobs[user_id]:
-        try:
-            keyboard = [
-                [
-                    InlineKeyboardButton(
-                        "📍 Send Location", callback_data=f"loc_{driver_id}"
-                    )
-                ]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    try:
+        keyboard = [
+            [InlineKeyboardButton("📍 Send Location", callback_data=f"loc_{driver_id}")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await application.bot.send_message(
-                chat_id=user_id,
-                text="📍 Please share your current location:",
-                reply_markup=reply_markup,
-            )
+        await application.bot.send_message(
+            chat_id=user_id,
+            text="📍 Please share your current location:",
+            reply_markup=reply_markup,
+        )
+
+    except Exception as e:
+        logging.error(f"Error in auto tracking for user {user_id}: {e}")
+        db_manager.delete_tracking_session(user_id)
+
+
+async def run_worker_tick(application):
+    now = time.time()
+    if coordinator.heartbeat_due(now):
+        coordinator.heartbeat(now)
+
+    # Schedule state lives in the database, so sessions survive restarts and
+    # move with their driver when the ring is rebalanced.
+    for session in db_manager.claim_due_tracking_sessions(
+        coordinator.worker_id, now, Config.AUTO_TRACK_INTERVAL
+    ):
+        await auto_track_location(
+            application, session["telegram_user_id"], session["driver_id"]
+        )
 
-            await asyncio.sleep(Config.AUTO_TRACK_INTERVAL)
 
+async def tracking_loop(application):
+    while True:
+        try:
+            await run_worker_tick(application)
         except Exception as e:
-            logging.error(f"Error in auto tracking for user {user_id}: {e}")
-            if user_id in tracking_jobs:
-                del tracking_jobs[user_id]
-            break
+            logging.error(f"Error in tracking loop: {e}")
+        await asyncio.sleep(1)
+
+
+async def start_tracking_loop(application):
+    application.bot_data["tracking_loop"] = asyncio.create_task(
+        tracking_loop(application)
+    )
+
+
+async def stop_tracking_loop(application):
+    task = application.bot_data.pop("tracking_loop", None)
+    if task:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
 
 async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -197,6 +242,7 @@ async def stop_tracking(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     driver_info = db_manager.get_driver_by_user_id(user_id)
 
     if driver_info:
+        db_manager.delete_tracking_session(user_id)
         if db_manager.deactivate_driver(driver_info["driver_id"]):
             await update.message.reply_text(
                 "🛑 Tracking stopped. Thank you for using Driver Tracking!",
@@ -208,15 +254,113 @@ async def stop_tracking(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         await update.message.reply_text("❌ You're not currently being tracked.")
 
 
+def get_update_user_id(update: Update):
+    if update.effective_user:
+        return update.effective_user.id
+    if update.effective_chat:
+        return update.effective_chat.id
+    return None
+
+
+async def route_updates(application, offset):
+    updates = await application.bot.get_updates(offset=offset, timeout=1)
+
+    for update in updates:
+        user_id = get_update_user_id(update)
+        if not db_manager.enqueue_update(
+            update.update_id,
+            user_id,
+            json.dumps(update.to_dict()),
+            coordinator.owner_of(user_id),
+            time.time(),
+        ):
+            # Leave the offset before this update so Telegram does not
+            # consider it delivered; the retry is deduplicated on update_id.
+            break
+        offset = update.update_id + 1
+
+    return offset
+
+
+async def process_owned_updates(application):
+    for row in db_manager.claim_updates(coordinator.worker_id, time.time()):
+        # Handle failures per row: an exception here must not leave the rest
+        # of the claimed batch stuck without processed_at.
+        try:
+            update = Update.de_json(json.loads(row["payload"]), application.bot)
+            await application.process_update(update)
+        except Exception as e:
+            logging.error(f"Error processing update {row['update_id']}: {e}")
+        finally:
+            db_manager.mark_update_processed(row["update_id"], time.time())
+
+
+async def run_sharded_worker(application):
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await application.initialize()
+    await application.start()
+    coordinator.start()
+
+    is_poller = False
+    offset = None
+
+    try:
+        while not stop_event.is_set():
+            try:
+                heartbeat = coordinator.heartbeat_due(time.time())
+                await run_worker_tick(application)
+
+                # Only one worker may call getUpdates at a time; it writes each
+                # update to the shared queue tagged with the driver's owner.
+                if heartbeat:
+                    was_poller = is_poller
+                    is_poller = coordinator.acquire_poller_lease()
+                    if is_poller and not was_poller:
+                        logging.info(f"Worker {coordinator.worker_id} is polling")
+                        await application.bot.delete_webhook()
+                        last_update_id = db_manager.get_last_update_id()
+                        offset = last_update_id + 1 if last_update_id else None
+
+                if is_poller:
+                    offset = await route_updates(application, offset)
+
+                await process_owned_updates(application)
+            except Exception as e:
+                logging.error(f"Error in worker {coordinator.worker_id}: {e}")
+
+            if not is_poller:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=1)
+                except asyncio.TimeoutError:
+                    pass
+    finally:
+        coordinator.leave()
+        await application.stop()
+        await application.shutdown()
+
+
 def main():
     print("🤖 Driver Tracking System - Telegram Bot Server")
     print("=" * 60)
 
-    if not Config.validate_config():
+    if not Config.validate_config() or not Config.validate_bot_config():
         print("\n❌ Configuration validation failed!")
         print("Please set the required environment variables.")
         exit(1)
 
+    global coordinator
+    coordinator = ShardCoordinator(
+        db_manager,
+        Config.BOT_WORKER_ID,
+        enabled=Config.BOT_SHARDING,
+        heartbeat_interval=Config.BOT_WORKER_HEARTBEAT,
+        worker_ttl=Config.BOT_WORKER_TTL,
+    )
+
     Config.print_config()
 
     if Config.is_production():
@@ -230,7 +374,11 @@ def main():
     print("🌐 Make sure the web server is running: python app.py")
     print("=" * 60)
 
-    application = Application.builder().token(Config.BOT_TOKEN).build()
+    builder = Application.builder().token(Config.BOT_TOKEN)
+    builder = builder.base_url(Config.TELEGRAM_API_URL)
+    if not Config.BOT_SHARDING:
+        builder = builder.post_init(start_tracking_loop).post_stop(stop_tracking_loop)
+    application = builder.build()
 
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("stop", stop_tracking))
@@ -240,8 +388,12 @@ def main():
     )
     application.add_handler(CallbackQueryHandler(handle_callback))
 
-    print("🤖 Telegram bot server starting...")
-    application.run_polling()
+    if Config.BOT_SHARDING:
+        print(f"🤖 Telegram bot worker {Config.BOT_WORKER_ID} starting (sharded)...")
+        asyncio.run(run_sharded_worker(application))
+    else:
+        print("🤖 Telegram bot server starting...")
+        application.run_polling()
 
 
 if __name__ == "__main__":
@@ -1,16 +1,37 @@
 import os
+import socket
 from typing import Optional
 
 
 class Config:
     BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN", "")
     BOT_USERNAME: str = os.getenv("TELEGRAM_BOT_USERNAME", "")
+    TELEGRAM_API_URL: str = os.getenv(
+        "TELEGRAM_API_URL", "https://api.telegram.org/bot"
+    )
+
+    BOT_SHARDING: bool = os.getenv("BOT_SHARDING", "False").lower() == "true"
+    BOT_WORKER_ID: str = os.getenv(
+        "BOT_WORKER_ID", f"{socket.gethostname()}-{os.getpid()}"
+    )
+    BOT_WORKER_HEARTBEAT: int = int(os.getenv("BOT_WORKER_HEARTBEAT", 5))
+    BOT_WORKER_TTL: int = int(os.getenv("BOT_WORKER_TTL", 15))
 
     FLASK_SECRET_KEY: str = os.getenv("FLASK_SECRET_KEY", "change-this-in-production")
     FLASK_HOST: str = os.getenv("FLASK_HOST", "0.0.0.0")
     FLASK_PORT: int = int(os.getenv("FLASK_PORT", 5000))
     FLASK_DEBUG: bool = os.getenv("FLASK_DEBUG", "False").lower() == "true"
 
+    WEB_SERVER_URL: str = os.getenv("WEB_SERVER_URL", "http://localhost:5000")
+    INTERNAL_API_TOKEN: str = os.getenv("INTERNAL_API_TOKEN", "")
+    # Placeholders from this repo's docs; never accept them as a real token.
+    INSECURE_INTERNAL_API_TOKENS = {
+        "",
+        "change-this-in-production",
+        "change-this-secret-key",
+        "your-internal-api-token-here",
+    }
+
     DATABASE_PATH: str = os.getenv("DATABASE_PATH", "/app/data/tracking.db")
 
     AUTO_TRACK_INTERVAL: int = int(os.getenv("AUTO_TRACK_INTERVAL", 30))
@@ -39,6 +60,23 @@ class Config:
 
         return True
 
+    @classmethod
+    def validate_bot_config(cls) -> bool:
+        # The poller lease and worker liveness are only renewed on a
+        # heartbeat, so they would expire between heartbeats.
+        if cls.BOT_SHARDING and cls.BOT_WORKER_HEARTBEAT >= cls.BOT_WORKER_TTL:
+            print(
+                "❌ BOT_WORKER_HEARTBEAT must be shorter than BOT_WORKER_TTL "
+                f"(got {cls.BOT_WORKER_HEARTBEAT}s and {cls.BOT_WORKER_TTL}s)"
+            )
+            return False
+
+        return True
+
+    @classmethod
+    def has_internal_api_token(cls) -> bool:
+        return cls.INTERNAL_API_TOKEN not in cls.INSECURE_INTERNAL_API_TOKENS
+
     @classmethod
     def get_tracking_link(cls, driver_id: str) -> str:
         return f"https://t.me/{cls.BOT_USERNAME}?start={driver_id}"
@@ -49,9 +87,14 @@ class Config:
         print(f"   Flask Host: {cls.FLASK_HOST}")
         print(f"   Flask Port: {cls.FLASK_PORT}")
         print(f"   Flask Debug: {cls.FLASK_DEBUG}")
+        print(f"   Web Server URL: {cls.WEB_SERVER_URL}")
+        internal_token = "✅ Set" if cls.has_internal_api_token() else "❌ Not Set"
+        print(f"   Internal API Token: {internal_token}")
         print(f"   Database: {cls.DATABASE_PATH}")
         print(f"   Bot Username: {cls.BOT_USERNAME}")
         print(f"   Auto Track Interval: {cls.AUTO_TRACK_INTERVAL}s")
+        print(f"   Bot Sharding: {cls.BOT_SHARDING}")
+        print(f"   Bot Worker ID: {cls.BOT_WORKER_ID}")
         print(f"   Bot Token: {'✅ Set' if cls.BOT_TOKEN else '❌ Not Set'}")
         print(f"   Allowed Hosts: {cls.ALLOWED_HOSTS}")
 
@@ -73,8 +116,12 @@ export FLASK_SECRET_KEY="your_secret_key_here"
 export FLASK_HOST="0.0.0.0"
 export FLASK_PORT="5000"
 export FLASK_DEBUG="False"
+export WEB_SERVER_URL="http://localhost:5000"
+export INTERNAL_API_TOKEN="your_internal_api_token_here"
 export DATABASE_PATH="database/tracking.db"
 export AUTO_TRACK_INTERVAL="30"
+export BOT_SHARDING="False"
+export BOT_WORKER_ID="bot-1"
 
 Or create a .env file:
 TELEGRAM_BOT_TOKEN=your_bot_token_here
@@ -3,6 +3,8 @@ import sqlite3
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from database.migrations import migrate
+
 
 class DatabaseManager:
     def __init__(self, db_path: str = "database/tracking.db"):
@@ -14,43 +16,7 @@ class DatabaseManager:
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
 
     def init_database(self):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS drivers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    driver_id TEXT UNIQUE NOT NULL,
-                    telegram_user_id INTEGER,
-                    username TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_active BOOLEAN DEFAULT TRUE
-                )
-            """
-            )
-
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS locations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    driver_id TEXT NOT NULL,
-                    latitude REAL NOT NULL,
-                    longitude REAL NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (driver_id) REFERENCES drivers (driver_id)
-                )
-            """
-            )
-
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_driver_id ON locations (driver_id)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_timestamp ON locations (timestamp)"
-            )
-
-            conn.commit()
+        migrate(self.db_path)
 
     def create_driver_session(self, driver_id: str) -> bool:
         try:
@@ -230,3 +196,367 @@ class DatabaseManager:
         except Exception as e:
             print(f"Error deactivating driver: {e}")
             return False
+
+    def heartbeat_worker(self, worker_id: str, now: float) -> bool:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO bot_workers (worker_id, started_at, last_heartbeat)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(worker_id) DO UPDATE SET last_heartbeat = excluded.last_heartbeat
+                """,
+                    (worker_id, now, now),
+                )
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error recording worker heartbeat: {e}")
+            return False
+
+    def remove_worker(self, worker_id: str) -> bool:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "DELETE FROM bot_workers WHERE worker_id = ?", (worker_id,)
+                )
+                cursor.execute(
+                    "DELETE FROM bot_leases WHERE worker_id = ?", (worker_id,)
+                )
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error removing worker: {e}")
+            return False
+
+    def get_live_workers(self, since: float) -> Optional[List[str]]:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT worker_id
+                    FROM bot_workers
+                    WHERE last_heartbeat >= ?
+                    ORDER BY worker_id
+                """,
+                    (since,),
+                )
+                return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"Error getting live workers: {e}")
+            return None
+
+    def acquire_lease(
+        self, name: str, worker_id: str, now: float, expires_at: float
+    ) -> bool:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO bot_leases (name, worker_id, expires_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(name) DO UPDATE
+                    SET worker_id = excluded.worker_id, expires_at = excluded.expires_at
+                    WHERE bot_leases.worker_id = excluded.worker_id
+                       OR bot_leases.expires_at < ?
+                """,
+                    (name, worker_id, expires_at, now),
+                )
+                conn.commit()
+                return cursor.rowcount > 0
+        except Exception as e:
+            print(f"Error acquiring lease: {e}")
+            return False
+
+    def enqueue_update(
+        self,
+        update_id: int,
+        telegram_user_id: Optional[int],
+        payload: str,
+        owner_worker_id: str,
+        now: float,
+    ) -> bool:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                # While the driver has unprocessed updates keep routing to
+                # the worker that holds them, so one worker sees them in order.
+                cursor.execute(
+                    """
+                    INSERT OR IGNORE INTO bot_updates
+                        (update_id, telegram_user_id, payload, owner_worker_id, created_at)
+                    VALUES (?, ?, ?, COALESCE((
+                        SELECT owner_worker_id
+                        FROM bot_updates
+                        WHERE telegram_user_id IS ? AND processed_at IS NULL
+                        ORDER BY update_id DESC
+                        LIMIT 1
+                    ), ?), ?)
+                """,
+                    (
+                        update_id,
+                        telegram_user_id,
+                        payload,
+                        telegram_user_id,
+                        owner_worker_id,
+                        now,
+                    ),
+                )
+                conn.commit()
+                return True
+        except Exception as e:
+            print(f"Error enqueuing update: {e}")
+            return False
+
+    def get_last_update_id(self) -> Optional[int]:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT MAX(update_id) FROM bot_updates")
+                return cursor.fetchone()[0]
+        except Exception as e:
+            print(f"Error getting last update ID: {e}")
+            return None
+
+    def claim_updates(self, worker_id: str, now: float, limit: int = 100) -> List[Dict]:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute(
+                    """
+                    SELECT id, update_id, payload
+                    FROM bot_updates
+                    WHERE owner_worker_id = ? AND claimed_at IS NULL
+                    ORDER BY update_id
+                    LIMIT ?
+                """,
+                    (worker_id, limit),
+                )
+                rows = cursor.fetchall()
+                cursor.executemany(
+                    "UPDATE bot_updates SET claimed_at = ? WHERE id = ?",
+                    [(now, row[0]) for row in rows],
+                )
+                conn.commit()
+                return [{"update_id": row[1], "payload": row[2]} for row in rows]
+        except Exception as e:
+            print(f"Error claiming updates: {e}")
+            return []
+
+    def mark_update_processed(self, update_id: int, now: float) -> bool:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "UPDATE bot_updates SET processed_at = ? WHERE update_id = ?",
+                    (now, update_id),
+                )
+                conn.commit()
+                return cursor.rowcount > 0
+        except Exception as e:
+            print(f"Error marking update processed: {e}")
+            return False
+
+    def release_claimed_updates(self, worker_id: str) -> int:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    UPDATE bot_updates
+                    SET claimed_at = NULL
+                    WHERE owner_worker_id = ? AND processed_at IS NULL
+                """,
+                    (worker_id,),
+                )
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            print(f"Error releasing claimed updates: {e}")
+            return 0
+
+    def get_pending_update_owners(self) -> Optional[List[Dict]]:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT DISTINCT telegram_user_id, owner_worker_id
+                    FROM bot_updates
+                    WHERE processed_at IS NULL
+                """
+                )
+                return [
+                    {"telegram_user_id": row[0], "owner_worker_id": row[1]}
+                    for row in cursor.fetchall()
+                ]
+        except Exception as e:
+            print(f"Error getting pending updates: {e}")
+            return None
+
+    def reassign_updates(self, updates: List[Dict], worker_id: str) -> int:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                # Moves every unprocessed row of the driver at once, claimed
+                # or not, so the new owner replays them in update_id order.
+                cursor.executemany(
+                    """
+                    UPDATE bot_updates
+                    SET owner_worker_id = ?, claimed_at = NULL
+                    WHERE telegram_user_id IS ?
+                      AND owner_worker_id IS ?
+                      AND processed_at IS NULL
+                """,
+                    [
+                        (
+                            worker_id,
+                            update["telegram_user_id"],
+                            update["owner_worker_id"],
+                        )
+                        for update in updates
+                    ],
+                )
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            print(f"Error reassigning updates: {e}")
+            return 0
+
+    def purge_updates(self, before: float) -> int:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "DELETE FROM bot_updates WHERE processed_at < ?",
+                    (before,),
+                )
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            print(f"Error purging updates: {e}")
+            return 0
+
+    def create_tracking_session(
+        self,
+        telegram_user_id: int,
+        driver_id: str,
+        owner_worker_id: str,
+        next_run_at: Optional[float] = None,
+    ) -> bool:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT OR IGNORE INTO tracking_sessions
+                        (telegram_user_id, driver_id, owner_worker_id, next_run_at)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    (telegram_user_id, driver_id, owner_worker_id, next_run_at),
+                )
+                conn.commit()
+                return cursor.rowcount > 0
+        except Exception as e:
+            print(f"Error creating tracking session: {e}")
+            return False
+
+    def delete_tracking_session(self, telegram_user_id: int) -> bool:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "DELETE FROM tracking_sessions WHERE telegram_user_id = ?",
+                    (telegram_user_id,),
+                )
+                conn.commit()
+                return cursor.rowcount > 0
+        except Exception as e:
+            print(f"Error deleting tracking session: {e}")
+            return False
+
+    def get_tracking_session_owners(self) -> List[Dict]:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT telegram_user_id, owner_worker_id FROM tracking_sessions"
+                )
+                return [
+                    {"telegram_user_id": row[0], "owner_worker_id": row[1]}
+                    for row in cursor.fetchall()
+                ]
+        except Exception as e:
+            print(f"Error getting tracking sessions: {e}")
+            return []
+
+    def assign_tracking_sessions(
+        self, telegram_user_ids: List[int], worker_id: str
+    ) -> int:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    """
+                    UPDATE tracking_sessions
+                    SET owner_worker_id = ?
+                    WHERE telegram_user_id = ?
+                """,
+                    [(worker_id, user_id) for user_id in telegram_user_ids],
+                )
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            print(f"Error assigning tracking sessions: {e}")
+            return 0
+
+    def claim_due_tracking_sessions(
+        self, worker_id: str, now: float, interval: float
+    ) -> List[Dict]:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute(
+                    """
+                    SELECT telegram_user_id, driver_id
+                    FROM tracking_sessions
+                    WHERE owner_worker_id = ? AND next_run_at <= ?
+                """,
+                    (worker_id, now),
+                )
+                rows = cursor.fetchall()
+                cursor.executemany(
+                    """
+                    UPDATE tracking_sessions
+                    SET next_run_at = ?
+                    WHERE telegram_user_id = ?
+                """,
+                    [(now + interval, row[0]) for row in rows],
+                )
+                conn.commit()
+                return [
+                    {"telegram_user_id": row[0], "driver_id": row[1]} for row in rows
+                ]
+        except Exception as e:
+            print(f"Error claiming due tracking sessions: {e}")
+            return []
+
+    def get_lease_holder(self, name: str, now: float) -> Optional[str]:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT worker_id FROM bot_leases WHERE name = ? AND expires_at >= ?",
+                    (name, now),
+                )
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            print(f"Error getting lease holder: {e}")
+            return None
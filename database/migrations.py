@@ -0,0 +1,158 @@
+import os
+import sqlite3
+import threading
+from typing import List, Tuple
+
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (
+        1,
+        "initial schema",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS drivers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                driver_id TEXT UNIQUE NOT NULL,
+                telegram_user_id INTEGER,
+                username TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                is_active BOOLEAN DEFAULT TRUE
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS locations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                driver_id TEXT NOT NULL,
+                latitude REAL NOT NULL,
+                longitude REAL NOT NULL,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (driver_id) REFERENCES drivers (driver_id)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_driver_id ON locations (driver_id)",
+            "CREATE INDEX IF NOT EXISTS idx_timestamp ON locations (timestamp)",
+        ],
+    ),
+    (
+        2,
+        "bot worker sharding",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS bot_workers (
+                worker_id TEXT PRIMARY KEY,
+                started_at REAL NOT NULL,
+                last_heartbeat REAL NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS bot_leases (
+                name TEXT PRIMARY KEY,
+                worker_id TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS tracking_sessions (
+                telegram_user_id INTEGER PRIMARY KEY,
+                driver_id TEXT NOT NULL,
+                owner_worker_id TEXT,
+                next_run_at REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_tracking_owner
+            ON tracking_sessions (owner_worker_id, next_run_at)
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS bot_updates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                update_id INTEGER UNIQUE NOT NULL,
+                telegram_user_id INTEGER,
+                payload TEXT NOT NULL,
+                owner_worker_id TEXT,
+                created_at REAL NOT NULL,
+                claimed_at REAL
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_bot_updates_owner
+            ON bot_updates (owner_worker_id, claimed_at)
+            """,
+        ],
+    ),
+    (
+        3,
+        "bot update completion",
+        [
+            "ALTER TABLE bot_updates ADD COLUMN processed_at REAL",
+            """
+            CREATE INDEX IF NOT EXISTS idx_bot_updates_pending
+            ON bot_updates (processed_at, telegram_user_id)
+            """,
+        ],
+    ),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+_migrated_paths = set()
+_migrated_lock = threading.Lock()
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    )
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+    return cursor.fetchone()[0]
+
+
+def migrate(db_path: str) -> int:
+    """Bring the database at ``db_path`` up to SCHEMA_VERSION.
+
+    Each migration runs at most once per database (tracked in the
+    ``schema_migrations`` table) and the check itself runs at most once per
+    process, so constructing several DatabaseManager instances is cheap.
+    Returns the number of migrations applied.
+    """
+    with _migrated_lock:
+        if db_path in _migrated_paths:
+            return 0
+
+        applied = 0
+        with sqlite3.connect(db_path) as conn:
+            # Fast path: a single read when the schema is already current.
+            if get_schema_version(conn) < SCHEMA_VERSION:
+                # Take the write lock before re-reading the version so two
+                # processes starting together do not apply a migration twice.
+                conn.execute("BEGIN IMMEDIATE")
+                current = get_schema_version(conn)
+                for version, name, statements in MIGRATIONS:
+                    if version <= current:
+                        continue
+                    for statement in statements:
+                        conn.execute(statement)
+                    conn.execute(
+                        "INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                        (version, name),
+                    )
+                    applied += 1
+                conn.commit()
+
+        _migrated_paths.add(db_path)
+        return applied
+
+
+if __name__ == "__main__":
+    from config import Config
+
+    os.makedirs(os.path.dirname(Config.DATABASE_PATH), exist_ok=True)
+    count = migrate(Config.DATABASE_PATH)
+    print(f"✅ Applied {count} migration(s), schema version {SCHEMA_VERSION}")
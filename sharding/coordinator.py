@@ -0,0 +1,118 @@
+import logging
+import time
+from typing import List, Optional
+
+from database.db_manager import DatabaseManager
+from sharding.hash_ring import HashRing
+
+POLLER_LEASE = "telegram_poller"
+UPDATE_RETENTION_SECONDS = 3600
+
+
+class ShardCoordinator:
+    """Keeps this worker's view of the cluster and the drivers it owns.
+
+    Membership, ownership and schedule state live in the shared database so
+    that any worker can pick up a driver's tracking session after a restart
+    or when another worker joins or leaves. With sharding disabled the ring
+    only ever contains this worker, so it owns every session.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        worker_id: str,
+        enabled: bool = False,
+        heartbeat_interval: int = 5,
+        worker_ttl: int = 15,
+    ):
+        self.db_manager = db_manager
+        self.worker_id = worker_id
+        self.enabled = enabled
+        self.heartbeat_interval = heartbeat_interval
+        self.worker_ttl = worker_ttl
+        self.ring = HashRing([worker_id])
+        self.last_heartbeat = 0.0
+
+    def owner_of(self, telegram_user_id: Optional[int]) -> Optional[str]:
+        return self.ring.get_worker(telegram_user_id)
+
+    def heartbeat_due(self, now: float) -> bool:
+        return now - self.last_heartbeat >= self.heartbeat_interval
+
+    def heartbeat(self, now: Optional[float] = None) -> None:
+        now = now or time.time()
+        self.last_heartbeat = now
+
+        if self.enabled:
+            # On a database error keep the current ring: rebuilding it from a
+            # partial view would move every driver onto this worker.
+            if not self.db_manager.heartbeat_worker(self.worker_id, now):
+                return
+            workers = self.db_manager.get_live_workers(now - self.worker_ttl)
+            if workers is None:
+                return
+            if self.worker_id not in workers:
+                workers.append(self.worker_id)
+            self._update_ring(workers)
+            self.db_manager.purge_updates(now - UPDATE_RETENTION_SECONDS)
+
+        self.rebalance()
+
+    def _update_ring(self, workers: List[str]) -> None:
+        if sorted(workers) == self.ring.workers:
+            return
+
+        logging.info(
+            f"Worker {self.worker_id} rebalancing: "
+            f"{self.ring.workers} -> {sorted(workers)}"
+        )
+        self.ring = HashRing(workers)
+
+    def rebalance(self) -> None:
+        sessions = [
+            session["telegram_user_id"]
+            for session in self.db_manager.get_tracking_session_owners()
+            if session["owner_worker_id"] != self.worker_id
+            and self.owner_of(session["telegram_user_id"]) == self.worker_id
+        ]
+        if sessions:
+            self.db_manager.assign_tracking_sessions(sessions, self.worker_id)
+            logging.info(
+                f"Worker {self.worker_id} took over {len(sessions)} tracking session(s)"
+            )
+
+        if not self.enabled:
+            return
+
+        pending = self.db_manager.get_pending_update_owners()
+        if pending is None:
+            return
+
+        # A live worker drains its own backlog (the poller keeps routing a
+        # driver to it until that backlog is empty), so only updates held by
+        # a worker that has left the ring are moved, all at once.
+        updates = [
+            update
+            for update in pending
+            if update["owner_worker_id"] not in self.ring.workers
+            and self.owner_of(update["telegram_user_id"]) == self.worker_id
+        ]
+        if updates:
+            self.db_manager.reassign_updates(updates, self.worker_id)
+
+    def start(self) -> None:
+        # Updates this worker claimed before a crash or restart were never
+        # marked processed; make them claimable again.
+        if self.enabled:
+            self.db_manager.release_claimed_updates(self.worker_id)
+
+    def acquire_poller_lease(self, now: Optional[float] = None) -> bool:
+        now = now or time.time()
+        return self.db_manager.acquire_lease(
+            POLLER_LEASE, self.worker_id, now, now + self.worker_ttl
+        )
+
+    def leave(self) -> None:
+        if self.enabled:
+            self.db_manager.remove_worker(self.worker_id)
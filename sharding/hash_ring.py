@@ -0,0 +1,32 @@
+import bisect
+import hashlib
+from typing import Iterable, List, Optional, Tuple
+
+
+class HashRing:
+    """Consistent hash ring mapping Telegram user ids to bot workers.
+
+    Each worker is placed on the ring ``replicas`` times so that adding or
+    removing a worker only moves roughly 1/N of the users.
+    """
+
+    def __init__(self, workers: Iterable[str] = (), replicas: int = 100):
+        self.replicas = replicas
+        self.workers: List[str] = sorted(set(workers))
+        self._points: List[Tuple[int, str]] = sorted(
+            (self._hash(f"{worker}#{i}"), worker)
+            for worker in self.workers
+            for i in range(replicas)
+        )
+        self._keys = [point for point, _ in self._points]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+    def get_worker(self, telegram_user_id: Optional[int]) -> Optional[str]:
+        if not self._points:
+            return None
+
+        index = bisect.bisect(self._keys, self._hash(str(telegram_user_id or 0)))
+        return self._points[index % len(self._points)][1]
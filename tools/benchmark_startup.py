@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the bot process must not pull in at startup.
+BOT_FORBIDDEN_MODULES = ["app", "flask", "flask_socketio", "requests"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{
+    "import_seconds": time.perf_counter() - start,
+    "modules": sorted(sys.modules),
+}}))
+"""
+
+
+def run_probe(module: str, db_path: str) -> dict:
+    env = dict(os.environ, DATABASE_PATH=db_path)
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - started
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    probe["wall_seconds"] = wall
+    return probe
+
+
+def benchmark(module: str, runs: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "tracking.db")
+        # The first start creates the schema; the rest measure a restart
+        # against an already-migrated database.
+        first = run_probe(module, db_path)
+        restarts = [run_probe(module, db_path) for _ in range(runs)]
+
+    return {
+        "module": module,
+        "first_start": first["wall_seconds"],
+        "restart_median": statistics.median(r["wall_seconds"] for r in restarts),
+        "restart_max": max(r["wall_seconds"] for r in restarts),
+        "import_median": statistics.median(r["import_seconds"] for r in restarts),
+        "modules": set(restarts[-1]["modules"]),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure cold-start time of the bot and web processes."
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=1.0,
+        help="fail if the median restart time exceeds this many seconds",
+    )
+    args = parser.parse_args()
+
+    print("⏱️  Driver Tracking System - Startup Benchmark")
+    print("=" * 60)
+
+    ok = True
+    for module in ("bot", "app"):
+        stats = benchmark(module, args.runs)
+        print(f"{module}.py")
+        print(f"   First start (with migrations): {stats['first_start']:.3f}s")
+        print(f"   Restart median:                {stats['restart_median']:.3f}s")
+        print(f"   Restart max:                   {stats['restart_max']:.3f}s")
+        print(f"   Import median:                 {stats['import_median']:.3f}s")
+        print(f"   Modules loaded:                {len(stats['modules'])}")
+
+        if stats["restart_median"] > args.budget:
+            print(f"   ❌ Over budget ({args.budget:.3f}s)")
+            ok = False
+
+        if module == "bot":
+            leaked = [m for m in BOT_FORBIDDEN_MODULES if m in stats["modules"]]
+            if leaked:
+                print(f"   ❌ Bot imports web-only modules: {', '.join(leaked)}")
+                ok = False
+
+    print("=" * 60)
+    print("✅ Startup within budget" if ok else "❌ Startup benchmark failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import argparse
+import itertools
+import json
+import threading
+import time
+
+from flask import Flask, jsonify, request
+
+# Parameters PTB sends as plain strings; everything else is JSON-encoded.
+RAW_PARAMETERS = {"text", "callback_query_id", "parse_mode"}
+
+BOT_USER = {
+    "id": 1000000,
+    "is_bot": True,
+    "first_name": "Fake Tracking Bot",
+    "username": "fake_tracking_bot",
+}
+
+app = Flask(__name__)
+
+state_lock = threading.Condition()
+pending_updates = []
+sent_messages = []
+forwarded_locations = []
+update_ids = itertools.count(1)
+message_ids = itertools.count(1)
+
+
+def parse_parameters() -> dict:
+    params = dict(request.args)
+    params.update(request.form)
+    if request.is_json:
+        params.update(request.get_json(silent=True) or {})
+
+    parsed = {}
+    for key, value in params.items():
+        if key in RAW_PARAMETERS or not isinstance(value, str):
+            parsed[key] = value
+            continue
+        try:
+            parsed[key] = json.loads(value)
+        except ValueError:
+            parsed[key] = value
+    return parsed
+
+
+def make_user(user_id: int) -> dict:
+    return {"id": user_id, "is_bot": False, "first_name": f"Driver {user_id}"}
+
+
+def make_chat(user_id: int) -> dict:
+    return {"id": user_id, "type": "private", "first_name": f"Driver {user_id}"}
+
+
+def make_message(user_id: int, sender: dict, **fields) -> dict:
+    message = {
+        "message_id": next(message_ids),
+        "date": int(time.time()),
+        "chat": make_chat(user_id),
+        "from": sender,
+    }
+    message.update(fields)
+    return message
+
+
+def ok(result):
+    return jsonify({"ok": True, "result": result})
+
+
+@app.route("/bot<token>/<method>", methods=["GET", "POST"])
+def bot_api(token, method):
+    params = parse_parameters()
+
+    if method == "getMe":
+        return ok(BOT_USER)
+
+    if method == "getUpdates":
+        offset = params.get("offset") or 0
+        deadline = time.time() + min(float(params.get("timeout") or 0), 5)
+        with state_lock:
+            while True:
+                updates = [u for u in pending_updates if u["update_id"] >= offset]
+                remaining = deadline - time.time()
+                if updates or remaining <= 0:
+                    break
+                state_lock.wait(remaining)
+            # Like Telegram, getUpdates with an offset confirms older updates.
+            pending_updates[:] = [
+                u for u in pending_updates if u["update_id"] >= offset
+            ]
+        return ok(updates[: params.get("limit") or 100])
+
+    if method in ("sendMessage", "editMessageText"):
+        chat_id = int(params.get("chat_id") or 0)
+        message = make_message(chat_id, BOT_USER, text=params.get("text", ""))
+        with state_lock:
+            sent_messages.append(
+                {
+                    "token": token,
+                    "method": method,
+                    "chat_id": chat_id,
+                    "text": params.get("text", ""),
+                    "time": time.time(),
+                }
+            )
+        return ok(message if method == "sendMessage" else True)
+
+    # deleteWebhook, answerCallbackQuery, setMyCommands, ...
+    return ok(True)
+
+
+@app.route("/api/location-update", methods=["POST"])
+def location_update():
+    with state_lock:
+        forwarded_locations.append(request.get_json(silent=True))
+    return ok(True)
+
+
+@app.route("/_fake/updates", methods=["POST"])
+def inject_update():
+    """Queue an update from a driver.
+
+    Body: ``{"user_id": 42, "text": "/start <driver_id>"}`` or
+    ``{"user_id": 42, "location": {"latitude": .., "longitude": ..}}``.
+    """
+    payload = request.get_json(force=True)
+    user_id = int(payload["user_id"])
+    sender = make_user(user_id)
+
+    if "location" in payload:
+        message = make_message(user_id, sender, location=payload["location"])
+    else:
+        text = payload.get("text", "")
+        message = make_message(user_id, sender, text=text)
+        if text.startswith("/"):
+            command = text.split()[0]
+            message["entities"] = [
+                {"type": "bot_command", "offset": 0, "length": len(command)}
+            ]
+
+    update = {"update_id": next(update_ids), "message": message}
+    with state_lock:
+        pending_updates.append(update)
+        state_lock.notify_all()
+    return ok(update)
+
+
+@app.route("/_fake/messages")
+def list_messages():
+    with state_lock:
+        return ok(list(sent_messages))
+
+
+@app.route("/_fake/locations")
+def list_locations():
+    with state_lock:
+        return ok(list(forwarded_locations))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Minimal fake Telegram Bot API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+
+    print(f"🧪 Fake Bot API on http://{args.host}:{args.port}/bot")
+    app.run(host=args.host, port=args.port, threaded=True)
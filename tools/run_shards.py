@@ -0,0 +1,257 @@
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from database.db_manager import DatabaseManager  # noqa: E402
+from sharding.coordinator import POLLER_LEASE  # noqa: E402
+from sharding.hash_ring import HashRing  # noqa: E402
+
+PROMPT = "📍 Please share your current location:"
+ALREADY_RUNNING = "⚠️ Auto tracking is already running!"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(check, timeout: float, message: str):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        result = check()
+        if result:
+            return result
+        time.sleep(0.2)
+    raise AssertionError(f"Timed out waiting for {message}")
+
+
+class Cluster:
+    def __init__(self, tmp: str, api_port: int, interval: int):
+        self.tmp = tmp
+        self.api_url = f"http://127.0.0.1:{api_port}"
+        self.db_path = os.path.join(tmp, "tracking.db")
+        self.db_manager = DatabaseManager(self.db_path)
+        self.interval = interval
+        self.workers = {}
+
+    def start_worker(self, worker_id: str) -> None:
+        env = dict(
+            os.environ,
+            BOT_SHARDING="true",
+            BOT_WORKER_ID=worker_id,
+            BOT_WORKER_HEARTBEAT="1",
+            BOT_WORKER_TTL="3",
+            # Each worker gets its own token so the fake API can tell which
+            # worker sent a message; they all talk to the same fake bot.
+            TELEGRAM_BOT_TOKEN=f"123456:{worker_id}",
+            TELEGRAM_BOT_USERNAME="fake_tracking_bot",
+            TELEGRAM_API_URL=f"{self.api_url}/bot",
+            WEB_SERVER_URL=self.api_url,
+            INTERNAL_API_TOKEN="run-shards-internal-token",
+            DATABASE_PATH=self.db_path,
+            AUTO_TRACK_INTERVAL=str(self.interval),
+        )
+        log = open(os.path.join(self.tmp, f"{worker_id}.log"), "w")
+        self.workers[worker_id] = subprocess.Popen(
+            [sys.executable, "bot.py"],
+            cwd=REPO_ROOT,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+    def stop_worker(self, worker_id: str, sig=signal.SIGTERM) -> None:
+        process = self.workers.pop(worker_id)
+        process.send_signal(sig)
+        process.wait(timeout=10)
+
+    def stop_all(self) -> None:
+        for worker_id in list(self.workers):
+            self.stop_worker(worker_id)
+
+    def wait_for_members(self, expected) -> HashRing:
+        expected = sorted(expected)
+        wait_for(
+            lambda: self.db_manager.get_live_workers(time.time() - 3) == expected,
+            20,
+            f"workers {expected}",
+        )
+        # Ownership is eventually consistent: give every worker a couple of
+        # heartbeats to see the new membership before checking who owns what.
+        time.sleep(2.5)
+        return HashRing(expected)
+
+    def api_ready(self) -> bool:
+        try:
+            return requests.get(f"{self.api_url}/_fake/messages").ok
+        except requests.ConnectionError:
+            return False
+
+    def send(self, user_id: int, **payload) -> None:
+        requests.post(
+            f"{self.api_url}/_fake/updates", json=dict(payload, user_id=user_id)
+        ).raise_for_status()
+
+    def messages(self, since: float = 0, text: str = None):
+        result = requests.get(f"{self.api_url}/_fake/messages").json()["result"]
+        return [
+            m
+            for m in result
+            if m["time"] >= since and (text is None or m["text"] == text)
+        ]
+
+    def session_owners(self):
+        return {
+            s["telegram_user_id"]: s["owner_worker_id"]
+            for s in self.db_manager.get_tracking_session_owners()
+        }
+
+
+def check_owners(messages, ring: HashRing, label: str) -> None:
+    wrong = [
+        m for m in messages if m["token"].split(":")[1] != ring.get_worker(m["chat_id"])
+    ]
+    if wrong:
+        for m in wrong:
+            print(f"   chat {m['chat_id']} answered by {m['token'].split(':')[1]}")
+        raise AssertionError(f"{label}: {len(wrong)} message(s) sent by non-owner")
+    print(f"   ✅ {label}: {len(messages)} message(s), all from the owning worker")
+
+
+def run(workers: int, drivers: int, interval: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        api_port = free_port()
+        api = subprocess.Popen(
+            [sys.executable, "tools/fake_bot_api.py", "--port", str(api_port)],
+            cwd=REPO_ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        cluster = Cluster(tmp, api_port, interval)
+        try:
+            wait_for(cluster.api_ready, 10, "fake Bot API")
+            user_ids = list(range(1001, 1001 + drivers))
+            for user_id in user_ids:
+                cluster.db_manager.create_driver_session(f"driver-{user_id}")
+
+            worker_ids = [f"worker-{i}" for i in range(1, workers + 1)]
+            for worker_id in worker_ids:
+                cluster.start_worker(worker_id)
+            ring = cluster.wait_for_members(worker_ids)
+            print(f"🧪 {workers} workers up: {ring.workers}")
+
+            print("1. Drivers open their tracking links")
+            for user_id in user_ids:
+                cluster.send(user_id, text=f"/start driver-{user_id}")
+            replies = wait_for(
+                lambda: len(cluster.messages(text="📍")) >= drivers
+                and cluster.messages(text="📍"),
+                30,
+                "/start replies",
+            )
+            check_owners(replies, ring, "/start replies")
+
+            print("2. Drivers switch to auto tracking")
+            since = time.time()
+            for user_id in user_ids:
+                cluster.send(user_id, text="🛑 Stop Auto Tracking")
+                cluster.send(user_id, text="🔄 Start Auto Tracking")
+            prompts = wait_for(
+                lambda: len({m["chat_id"] for m in cluster.messages(since, PROMPT)})
+                >= drivers
+                and cluster.messages(since, PROMPT),
+                30,
+                "auto tracking prompts",
+            )
+            check_owners(prompts, ring, "auto tracking prompts")
+
+            print("3. A driver shares a location")
+            cluster.send(user_ids[0], location={"latitude": 52.52, "longitude": 13.405})
+            wait_for(
+                lambda: requests.get(f"{cluster.api_url}/_fake/locations").json()[
+                    "result"
+                ],
+                10,
+                "forwarded location",
+            )
+            print("   ✅ location forwarded to the web server")
+
+            crashed = cluster.db_manager.get_lease_holder(POLLER_LEASE, time.time())
+            print(f"4. {crashed} (the poller) crashes")
+            cluster.stop_worker(crashed, signal.SIGKILL)
+            worker_ids.remove(crashed)
+            ring = cluster.wait_for_members(worker_ids)
+            wait_for(
+                lambda: set(cluster.session_owners().values()) <= set(worker_ids),
+                20,
+                "sessions to move off the crashed worker",
+            )
+            since = time.time() + 1
+            time.sleep(interval * 2 + 1)
+            check_owners(cluster.messages(since, PROMPT), ring, "prompts after crash")
+            since = time.time()
+            for user_id in user_ids:
+                cluster.send(user_id, text="🔄 Start Auto Tracking")
+            replies = wait_for(
+                lambda: len(cluster.messages(since, ALREADY_RUNNING)) >= drivers
+                and cluster.messages(since, ALREADY_RUNNING),
+                30,
+                "replies via the new poller",
+            )
+            check_owners(replies, ring, "replies via the new poller")
+
+            joined = f"worker-{workers + 1}"
+            print(f"5. {joined} joins")
+            cluster.start_worker(joined)
+            worker_ids.append(joined)
+            ring = cluster.wait_for_members(worker_ids)
+            wait_for(
+                lambda: joined in cluster.session_owners().values()
+                and all(
+                    owner == ring.get_worker(user_id)
+                    for user_id, owner in cluster.session_owners().items()
+                ),
+                20,
+                f"sessions to move to {joined}",
+            )
+            since = time.time() + 1
+            time.sleep(interval * 2 + 1)
+            check_owners(cluster.messages(since, PROMPT), ring, "prompts after join")
+
+            print("✅ Sharded bot workers behaved as expected")
+        finally:
+            cluster.stop_all()
+            api.terminate()
+            api.wait(timeout=10)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run several sharded bot workers against a fake Bot API."
+    )
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--interval", type=int, default=2)
+    args = parser.parse_args()
+
+    try:
+        run(args.workers, args.drivers, args.interval)
+    except AssertionError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())